@@ -1,36 +1,50 @@
+import codecs
+import ctypes
+import errno
+import json
 import os
 import shlex
 import shutil
+import stat
 import subprocess
 import sys
-import tempfile
+import tarfile
+import threading
+import time
+import zipfile
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
-from typing import Deque, Iterable, Optional, Set, cast
+from typing import TYPE_CHECKING, Deque, Iterable, Optional, Set, cast
 
-if sys.version_info >= (3, 11):
-    import tomllib
-else:
-    try:
-        import toml
-    except ImportError:
-        sys.exit(
-            "Error: 'toml' package not found. Please run 'pip install toml' or the setup script."
-        )
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 import platformdirs
+from PIL import Image as PILImage
 from rich.style import Style
-from rich.syntax import Syntax
 from rich.text import Text
+from textual import work
 from textual.app import App, ComposeResult
+from textual.cache import LRUCache
 from textual.containers import Horizontal, Vertical, Container
 from textual.events import Key
+from textual.timer import Timer
+from textual.widget import Widget
+from textual.worker import get_current_worker
 from textual.widgets import DirectoryTree, Footer, Input, Label, Log, Static, Tree
 from textual.widgets._directory_tree import DirEntry
-from textual.widgets.tree import TreeNode
-from textual_autocomplete import PathAutoComplete
+from textual.widgets.tree import TreeNode, UnknownNodeID
 from textual_image.widget import Image as ImageWidget
 
+if TYPE_CHECKING:
+    from textual_autocomplete import PathAutoComplete
+
 # --- Configuration Setup ---
 APP_NAME = "veld-fm"
 APP_AUTHOR = "BranBushes"
@@ -62,27 +76,437 @@ DEFAULT_KEYBINDINGS = {
     # Vim Mode
     "command_mode": {"key": ":", "description": "Command Mode"},
 }
+DEFAULT_CONFIG_TEXT = "# Veld File Manager Keybindings\n[keybindings]\n" + "".join(
+    f'{action} = "{details["key"]}" # {details["description"]}\n'
+    for action, details in DEFAULT_KEYBINDINGS.items()
+)
 
 
-SUPPORTED_ARCHIVE_EXTENSIONS = tuple(
-    ext for _, exts, _ in shutil.get_unpack_formats() for ext in exts
+ARCHIVE_UNPACK_FORMATS = {
+    ext.lower(): name for name, exts, _ in shutil.get_unpack_formats() for ext in exts
+}
+IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".gif", ".bmp"})
+BINARY_EXTENSIONS = frozenset(
+    {
+        ".7z",
+        ".a",
+        ".bin",
+        ".bz2",
+        ".class",
+        ".dll",
+        ".dylib",
+        ".exe",
+        ".gz",
+        ".iso",
+        ".jar",
+        ".mkv",
+        ".mp3",
+        ".mp4",
+        ".o",
+        ".pdf",
+        ".pyc",
+        ".so",
+        ".tar",
+        ".tgz",
+        ".webm",
+        ".xz",
+        ".zip",
+    }
 )
-IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp")
+HOME_DIR = os.path.expanduser("~")
+IS_UNIX = sys.platform not in ("win32", "darwin")
+PREVIEW_BYTES = 1024 * 10
+PREVIEW_MAX_SIZE = 1024 * 1024
+IMAGE_PREVIEW_MAX_SIZE = (1024, 1024)
+BINARY_SNIFF_BYTES = 512
+ZIP_COMPRESSLEVEL = 1
+IGNORED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".tox",
+        ".venv",
+        "__pycache__",
+        "node_modules",
+        "target",
+    }
+)
+SEARCH_BATCH_SIZE = 256
+SEARCH_FLUSH_INTERVAL = 0.05
+LISTING_CACHE_SIZE = 256
+PATH_COMPLETION_CACHE_SIZE = 100
+LISTING_CACHE_MIN_AGE_NS = 2_000_000_000
+STAT_CACHE_TTL = 2.0
+FILE_OP_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+FILE_OP_THREAD_PREFIX = "veld-fileop"
+SELECTED_STYLE = Style.parse("b black on green")
+TREE_KEY_ACTIONS = frozenset(
+    {"nav_up", "nav_down", "nav_parent", "select_item", "toggle_selection"}
+)
+PANEL_INPUT_ACTIONS = frozenset(
+    {
+        "delete_selected",
+        "archive_selected",
+        "extract_archive",
+        "copy_selected",
+        "copy_selected_vim",
+        "move_selected",
+        "rename",
+        "create_directory",
+    }
+)
+TAR_WRITE_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tbz2": "w:bz2",
+    ".tar.xz": "w:xz",
+    ".txz": "w:xz",
+}
 
 
-def generate_duplicate_path(original_path: Path) -> Path:
+@lru_cache(maxsize=10000)
+def _timed_stat(path_str: str, epoch: int) -> os.stat_result:
+    return os.stat(path_str)
+
+
+def cached_stat(path_str: str) -> os.stat_result:
+    return _timed_stat(path_str, int(time.monotonic() // STAT_CACHE_TTL))
+
+
+def clear_stat_cache() -> None:
+    _timed_stat.cache_clear()
+
+
+def stat_or_none(path) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def path_is_dir(path) -> bool:
+    try:
+        return stat.S_ISDIR(cached_stat(os.fspath(path)).st_mode)
+    except OSError:
+        return False
+
+
+def normalize_user_path(value: str) -> Path:
+    return Path(os.path.abspath(os.path.expanduser(value)))
+
+
+def same_path(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def path_is_file(path) -> bool:
+    try:
+        return stat.S_ISREG(cached_stat(os.fspath(path)).st_mode)
+    except OSError:
+        return False
+
+
+def get_unpack_format(path: Path) -> Optional[str]:
+    suffix = path.suffix.lower()
+    if suffix in ARCHIVE_UNPACK_FORMATS:
+        return ARCHIVE_UNPACK_FORMATS[suffix]
+    return ARCHIVE_UNPACK_FORMATS.get("".join(path.suffixes[-2:]).lower())
+
+
+def looks_binary(data: bytes) -> bool:
+    sample = data[:BINARY_SNIFF_BYTES]
+    if b"\0" in sample:
+        return True
+    control = sum(1 for byte in sample if byte < 9 or 13 < byte < 32)
+    return control > len(sample) // 8
+
+
+def generate_duplicate_path(
+    original_path: Path, existing: Optional[Set[str]] = None
+) -> Path:
     parent = original_path.parent
     stem = original_path.stem
     suffix = original_path.suffix
+    if existing is None:
+        with os.scandir(parent) as entries:
+            existing = {entry.name for entry in entries}
     counter = 1
     while True:
         new_name = f"{stem} ({counter}){suffix}"
-        new_path = parent / new_name
-        if not new_path.exists():
-            return new_path
+        if new_name not in existing:
+            existing.add(new_name)
+            return parent / new_name
         counter += 1
 
 
+FICLONE = 0x40049409
+AT_FDCWD = -100
+RENAME_NOREPLACE = 1
+COPY_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOTTY,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+}
+
+
+def _copy_fd_contents(src_fd: int, dst_fd: int, size: int) -> None:
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return
+        except OSError as e:
+            if e.errno not in COPY_FALLBACK_ERRNOS:
+                raise
+    chunk = max(size, 1 << 23)
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(src_fd, dst_fd, chunk):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in COPY_FALLBACK_ERRNOS:
+                raise
+    if hasattr(os, "sendfile"):
+        try:
+            while os.sendfile(dst_fd, src_fd, None, chunk):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in COPY_FALLBACK_ERRNOS:
+                raise
+    with open(src_fd, "rb", closefd=False) as fsrc:
+        with open(dst_fd, "wb", closefd=False) as fdst:
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+
+
+def fast_copy(src, dst) -> str:
+    src = os.fspath(src)
+    dst = os.fspath(dst)
+    dst_st = stat_or_none(dst)
+    if dst_st is not None and stat.S_ISDIR(dst_st.st_mode):
+        dst = os.path.join(dst, os.path.basename(src))
+        dst_st = stat_or_none(dst)
+
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        src_st = os.fstat(src_fd)
+        if dst_st is not None and os.path.samestat(src_st, dst_st):
+            raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+        size = src_st.st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            _copy_fd_contents(src_fd, dst_fd, size)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _load_renameat2():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return None
+    renameat2.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_uint,
+    ]
+    return renameat2
+
+
+_renameat2 = _load_renameat2()
+
+
+def rename_noreplace(src_path: Path, dest_path: Path) -> None:
+    if _renameat2 is not None:
+        src, dst = os.fsencode(src_path), os.fsencode(dest_path)
+        if _renameat2(AT_FDCWD, src, AT_FDCWD, dst, RENAME_NOREPLACE) == 0:
+            return
+        err = ctypes.get_errno()
+        if err not in (errno.ENOSYS, errno.EINVAL):
+            raise OSError(err, os.strerror(err), os.fspath(src_path))
+    if os.path.lexists(dest_path):
+        raise FileExistsError(
+            errno.EEXIST, os.strerror(errno.EEXIST), os.fspath(dest_path)
+        )
+    os.rename(src_path, dest_path)
+
+
+def _copy_file_with_stat(src: str, dst: str, st: os.stat_result) -> None:
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            _copy_fd_contents(src_fd, dst_fd, st.st_size)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+@lru_cache(maxsize=1)
+def file_op_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=FILE_OP_WORKERS, thread_name_prefix=FILE_OP_THREAD_PREFIX
+    )
+
+
+def on_file_op_thread() -> bool:
+    return threading.current_thread().name.startswith(FILE_OP_THREAD_PREFIX)
+
+
+def fast_copytree(src: str, dst: str, dirs_exist_ok: bool = False) -> None:
+    dst_st = stat_or_none(dst)
+    if dst_st is not None and os.path.samestat(os.stat(src), dst_st):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same directory")
+    if not dirs_exist_ok and os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+    files = []
+    dirs = []
+    pending = [(src, dst)]
+    while pending:
+        src_dir, dst_dir = pending.pop()
+        with os.scandir(src_dir) as it:
+            entries = list(it)
+        try:
+            os.mkdir(dst_dir)
+        except FileExistsError:
+            if not os.path.isdir(dst_dir):
+                raise
+        dirs.append((src_dir, dst_dir))
+        for entry in entries:
+            target = os.path.join(dst_dir, entry.name)
+            if entry.is_symlink():
+                if os.path.lexists(target):
+                    os.unlink(target)
+                os.symlink(os.readlink(entry.path), target)
+                continue
+            st = entry.stat(follow_symlinks=False)
+            if stat.S_ISDIR(st.st_mode):
+                pending.append((entry.path, target))
+            elif stat.S_ISREG(st.st_mode):
+                files.append((entry.path, target, st))
+            else:
+                raise shutil.SpecialFileError(f"`{entry.path}` is not a regular file")
+    if len(files) > 1 and not on_file_op_thread():
+        futures = [file_op_pool().submit(_copy_file_with_stat, *job) for job in files]
+        for future in futures:
+            future.result()
+    else:
+        for job in files:
+            _copy_file_with_stat(*job)
+    for src_dir, dst_dir in reversed(dirs):
+        shutil.copystat(src_dir, dst_dir)
+
+
+def copy_path(src_path: Path, dest_path: Path, replace: bool = False) -> None:
+    if src_path.is_dir():
+        fast_copytree(os.fspath(src_path), os.fspath(dest_path), replace)
+    else:
+        fast_copy(src_path, dest_path)
+
+
+def outermost_paths(path_strs: Iterable[str]) -> list[str]:
+    kept: list[str] = []
+    for path_str in sorted(path_strs, key=lambda p: p.split(os.sep)):
+        if kept and path_str.startswith(os.path.join(kept[-1], "")):
+            continue
+        kept.append(path_str)
+    return kept
+
+
+def share_completion_cache(autocomplete: "PathAutoComplete", cache: LRUCache) -> None:
+    # PathAutoComplete has no public way to share its directory cache; only
+    # swap it in when the attribute is the LRUCache textual-autocomplete 4.x uses.
+    if isinstance(getattr(autocomplete, "_directory_cache", None), LRUCache):
+        autocomplete._directory_cache = cache
+
+
+def failure_summary(verb: str, failures: list) -> str:
+    if len(failures) == 1:
+        name, error = failures[0]
+        return f"Error {verb} {name}: {error}"
+    shown = "; ".join(f"{name}: {error}" for name, error in failures[:3])
+    if len(failures) > 3:
+        shown += f"; and {len(failures) - 3} more"
+    return f"Error {verb} {len(failures)} items: {shown}"
+
+
+def remove_path(path) -> None:
+    if stat.S_ISDIR(os.lstat(path).st_mode):
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+def move_path(src_path: Path, dest_path: Path) -> None:
+    try:
+        os.rename(src_path, dest_path)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    if os.path.islink(src_path):
+        os.symlink(os.readlink(src_path), dest_path)
+        os.unlink(src_path)
+        return
+    copy_path(src_path, dest_path)
+    remove_path(src_path)
+
+
+def write_archive(archive_path: Path, sources: Iterable[Path]) -> None:
+    archive_name = archive_path.name.lower()
+    if archive_name.endswith(".zip"):
+        with zipfile.ZipFile(
+            archive_path, "w", zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL
+        ) as zf:
+            for src in sources:
+                zf.write(src, arcname=src.name)
+                if not src.is_dir():
+                    continue
+                base = os.path.dirname(os.fspath(src))
+                for dirpath, dirnames, filenames in os.walk(src):
+                    dirnames.sort()
+                    for name in dirnames + sorted(filenames):
+                        child = os.path.join(dirpath, name)
+                        zf.write(child, arcname=os.path.relpath(child, base))
+        return
+    for suffix, mode in TAR_WRITE_MODES.items():
+        if archive_name.endswith(suffix):
+            with tarfile.open(archive_path, mode) as tf:
+                for src in sources:
+                    tf.add(src, arcname=src.name)
+            return
+    raise ValueError(
+        f"Unsupported archive format '{archive_path.suffix}'. "
+        f"Use .zip or one of: {', '.join(TAR_WRITE_MODES)}."
+    )
+
+
+_CONFIG_CACHE: dict = {}
+
+
 def load_or_create_config() -> dict:
     config_dir = Path(platformdirs.user_config_dir(APP_NAME, APP_AUTHOR))
     config_path = config_dir / "config.toml"
@@ -92,34 +516,110 @@ def load_or_create_config() -> dict:
 
     if not config_path.is_file():
         config_dir.mkdir(parents=True, exist_ok=True)
-        with open(config_path, "w", encoding="utf-8") as f:
-            f.write("# Veld File Manager Keybindings\n[keybindings]\n")
-            for action, details in DEFAULT_KEYBINDINGS.items():
-                f.write(f'{action} = "{details["key"]}" # {details["description"]}\n')
+        config_path.write_text(DEFAULT_CONFIG_TEXT, encoding="utf-8")
+        return keybindings
+
+    try:
+        st = config_path.stat()
+    except OSError:
+        return keybindings
+    signature = (st.st_mtime_ns, st.st_size)
+    user_keybindings = _CONFIG_CACHE.get((str(config_path), signature))
+    if user_keybindings is not None:
+        keybindings.update(user_keybindings)
+        return keybindings
+
+    cache_path = config_dir / "config.cache.json"
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cached = None
+    if (
+        isinstance(cached, dict)
+        and cached.get("signature") == list(signature)
+        and isinstance(cached.get("keybindings"), dict)
+    ):
+        user_keybindings = cached["keybindings"]
+        _CONFIG_CACHE[(str(config_path), signature)] = user_keybindings
+        keybindings.update(user_keybindings)
         return keybindings
 
     try:
+        text = config_path.read_text(encoding="utf-8")
+    except OSError:
+        return keybindings
+    if text == DEFAULT_CONFIG_TEXT:
+        user_keybindings = {}
+    else:
         if sys.version_info >= (3, 11):
-            with open(config_path, "rb") as f:
-                user_config = tomllib.load(f)
+            import tomllib
         else:
-            with open(config_path, "r", encoding="utf-8") as f:
-                user_config = toml.load(f)
-        keybindings.update(user_config.get("keybindings", {}))
-    except Exception:
-        return keybindings
+            try:
+                import toml
+            except ImportError:
+                sys.exit(
+                    "Error: 'toml' package not found. Please run 'pip install toml' or the setup script."
+                )
+
+        try:
+            if sys.version_info >= (3, 11):
+                user_config = tomllib.loads(text)
+            else:
+                user_config = toml.loads(text)
+            user_keybindings = user_config.get("keybindings", {})
+        except Exception:
+            return keybindings
+    keybindings.update(user_keybindings)
+    _CONFIG_CACHE[(str(config_path), signature)] = user_keybindings
+
+    try:
+        cache_path.write_text(
+            json.dumps({"signature": list(signature), "keybindings": user_keybindings}),
+            encoding="utf-8",
+        )
+    except (OSError, TypeError, ValueError):
+        pass
     return keybindings
 
 
 # --- Search Functionality ---
 class SearchResultTree(Tree[Path]):
+    BATCH_SIZE = 200
+
     def __init__(self, search_results: Iterable[Path], **kwargs) -> None:
         super().__init__("Search Results", data=Path(), **kwargs)
-        self.search_results = search_results
+        self._pending = list(search_results)
+        self._next_index = 0
+        self._drain_timer: Optional[Timer] = None
 
     def on_mount(self) -> None:
-        for path in self.search_results:
-            self.root.add(str(path), data=path)
+        self._add_batch()
+        if self._next_index < len(self._pending):
+            self._drain_timer = self.set_interval(0.05, self._drain_batch)
+
+    def _add_batch(self) -> None:
+        batch = self._pending[self._next_index : self._next_index + self.BATCH_SIZE]
+        self._next_index += len(batch)
+        add = self.root.add
+        with self.app.batch_update():
+            for path in batch:
+                add(str(path), data=path)
+
+    def extend(self, paths: Iterable[Path]) -> None:
+        self._pending.extend(paths)
+        if self._drain_timer is None:
+            self._add_batch()
+            if self._next_index < len(self._pending):
+                self._drain_timer = self.set_interval(0.05, self._drain_batch)
+
+    def _drain_batch(self) -> None:
+        self._add_batch()
+        if self._next_index >= len(self._pending):
+            if self._drain_timer:
+                self._drain_timer.stop()
+                self._drain_timer = None
+            self._pending = []
+            self._next_index = 0
 
 
 class SearchPanel(Vertical):
@@ -133,63 +633,200 @@ class SearchPanel(Vertical):
 
 # --- Tiling Components ---
 class SelectableDirectoryTree(DirectoryTree):
+    POPULATE_BATCH_SIZE = 128
+
     def __init__(
         self, path: str, *, panel: "FilePanel", key_map: dict, id: str | None = None
     ) -> None:
         self.panel_ref = panel
         self.key_map = key_map
+        self._key_dispatch = self._build_key_dispatch()
+        self._populate_tokens: dict = {}
+        self._populate_eagerly = False
+        self._listing_cache: dict = {}
         super().__init__(path, id=id)
 
+    @work(thread=True, exit_on_error=False)
+    def _load_directory(self, node: TreeNode[DirEntry]) -> tuple:
+        assert node.data is not None
+        location = os.fspath(node.data.path.expanduser())
+        try:
+            mtime_ns = os.stat(location).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        cached = self._listing_cache.get(location)
+        if cached is not None and cached[0] == mtime_ns:
+            return location, self._filter_entries(location, cached[1])
+        worker = get_current_worker()
+        entries = []
+        try:
+            with os.scandir(location) as it:
+                for entry in it:
+                    if worker.is_cancelled:
+                        break
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    entries.append((sys.intern(entry.name), is_dir))
+        except PermissionError:
+            pass
+        entries.sort(key=lambda entry: (not entry[1], entry[0].lower()))
+        if (
+            mtime_ns is not None
+            and not worker.is_cancelled
+            and time.time_ns() - mtime_ns > LISTING_CACHE_MIN_AGE_NS
+        ):
+            self._listing_cache.pop(location, None)
+            self._listing_cache[location] = (mtime_ns, entries)
+            if len(self._listing_cache) > LISTING_CACHE_SIZE:
+                del self._listing_cache[next(iter(self._listing_cache))]
+        return location, self._filter_entries(location, entries)
+
+    def _filter_entries(self, location: str, entries: list) -> list:
+        if type(self).filter_paths is DirectoryTree.filter_paths:
+            return entries
+        kept = {
+            path.name
+            for path in self.filter_paths(
+                Path(os.path.join(location, name)) for name, _ in entries
+            )
+        }
+        return [entry for entry in entries if entry[0] in kept]
+
+    def find_node(self, relative_path: str) -> TreeNode[DirEntry] | None:
+        node = self.root
+        for part in relative_path.split(os.sep):
+            if not part:
+                continue
+            for child in node.children:
+                if child.data is not None and child.data.path.name == part:
+                    node = child
+                    break
+            else:
+                return None
+        return node
+
+    async def _reload(self, node: TreeNode[DirEntry]) -> None:
+        self._populate_eagerly = True
+        try:
+            await super()._reload(node)
+        finally:
+            self._populate_eagerly = False
+        self.panel_ref.sync_cursor()
+
+    def _populate_node(self, node: TreeNode[DirEntry], content: Iterable) -> None:
+        node.remove_children()
+        parent, entries = content
+        if self._populate_eagerly:
+            self._populate_tokens.pop(node.id, None)
+            self._add_children(node, parent, entries)
+        else:
+            token = self._populate_tokens[node.id] = object()
+            self._add_child_batch(node, parent, entries, 0, token)
+        node.expand()
+
+    def _add_children(
+        self, node: TreeNode[DirEntry], parent: str, entries: list
+    ) -> None:
+        for name, is_dir in entries:
+            path = Path(os.path.join(parent, name))
+            node.add(name, data=DirEntry(path), allow_expand=is_dir)
+
+    def _is_live(self, node: TreeNode[DirEntry]) -> bool:
+        try:
+            return self.get_node_by_id(node.id) is node
+        except UnknownNodeID:
+            return False
+
+    def refresh_paths(self, path_strs: Set[str]) -> None:
+        pending = [self.root]
+        while pending:
+            node = pending.pop()
+            if node.data is not None and os.fspath(node.data.path) in path_strs:
+                node.refresh()
+            if node.is_expanded:
+                pending.extend(node.children)
+
+    def _add_child_batch(
+        self,
+        node: TreeNode[DirEntry],
+        parent: str,
+        entries: list,
+        start: int,
+        token: object,
+    ) -> None:
+        if self._populate_tokens.get(node.id) is not token or not self._is_live(node):
+            return
+        end = start + self.POPULATE_BATCH_SIZE
+        self._add_children(node, parent, entries[start:end])
+        if end < len(entries):
+            self.call_after_refresh(
+                self._add_child_batch, node, parent, entries, end, token
+            )
+        else:
+            del self._populate_tokens[node.id]
+
     def on_mount(self) -> None:
         super().on_mount()
         if self.cursor_node and self.cursor_node.data:
-            self.panel_ref.cursor_path = self.cursor_node.data.path
+            self.panel_ref.set_cursor_node(self.cursor_node)
 
     def on_tree_node_highlighted(self, event: Tree.NodeHighlighted[DirEntry]) -> None:
         if event.node and event.node.data:
-            self.panel_ref.cursor_path = event.node.data.path
+            self.panel_ref.set_cursor_node(event.node)
             cast("FileExplorerApp", self.app).update_preview(event.node.data.path)
 
     def render_label(
         self, node: TreeNode[DirEntry], base_style: Style, style: Style
     ) -> Text:
         rendered = super().render_label(node, base_style, style)
-        if node.data and node.data.path in self.panel_ref.selected_paths:
-            rendered.style = "b black on green"
+        selected_paths = self.panel_ref.selected_paths
+        if selected_paths and node.data and os.fspath(node.data.path) in selected_paths:
+            rendered.style = SELECTED_STYLE
         return rendered
 
     def on_key(self, event: Key) -> None:
-        key = event.key
-
-        if key == self.key_map.get("nav_up"):
+        handler = self._key_dispatch.get(event.key)
+        if handler:
             event.stop()
-            self.action_cursor_up()
-        elif key == self.key_map.get("nav_down"):
-            event.stop()
-            self.action_cursor_down()
-        elif key == self.key_map.get("nav_parent"):
-            event.stop()
-            self.action_cursor_parent()
-        elif key == self.key_map.get("select_item"):
-            event.stop()
-            if self.cursor_node and self.cursor_node.data:
-                path = self.cursor_node.data.path
-                if path.is_file():
-                    cast("FileExplorerApp", self.app).action_open_file()
-                elif path.is_dir():
-                    self.action_toggle_node()
-        elif key == self.key_map.get("toggle_selection"):
-            event.stop()
-            self.panel_ref.action_toggle_selection()
+            handler()
+
+    def _build_key_dispatch(self) -> dict:
+        handlers = {
+            "nav_up": self.action_cursor_up,
+            "nav_down": self.action_cursor_down,
+            "nav_parent": self.action_cursor_parent,
+            "select_item": self._select_cursor_item,
+            "toggle_selection": self.panel_ref.action_toggle_selection,
+        }
+        dispatch = {}
+        for action, handler in handlers.items():
+            key = self.key_map.get(action)
+            if key is not None:
+                dispatch.setdefault(key, handler)
+        return dispatch
+
+    def _select_cursor_item(self) -> None:
+        if self.cursor_node and self.cursor_node.data:
+            path = self.cursor_node.data.path
+            if path_is_file(path):
+                cast("FileExplorerApp", self.app).action_open_file()
+            elif path_is_dir(path):
+                self.action_toggle_node()
 
 
 class FilePanel(Vertical):
     def __init__(self, path: str, *, key_map: dict, **kwargs) -> None:
         super().__init__(**kwargs)
         self.start_path = path
+        self._start_str = os.path.join(os.path.realpath(path), "")
         self.key_map = key_map
-        self.selected_paths: Set[Path] = set()
+        self.selected_paths: Set[str] = set()
         self._cursor_path: Path | None = None
+        self._cursor_is_dir = False
+        self._last_label_key: tuple | None = None
+        self._label_timer: Timer | None = None
         self.directory_tree = SelectableDirectoryTree(
             self.start_path, panel=self, key_map=self.key_map, id="dir_tree"
         )
@@ -202,30 +839,110 @@ class FilePanel(Vertical):
     @cursor_path.setter
     def cursor_path(self, new_path: Path | None) -> None:
         self._cursor_path = new_path
+        if self._label_timer is not None:
+            self._label_timer.stop()
+        self._label_timer = self.set_timer(0.016, self._flush_path_label)
+
+    @property
+    def cursor_is_dir(self) -> bool:
+        return self._cursor_path is not None and self._cursor_is_dir
+
+    def set_cursor_node(self, node: TreeNode[DirEntry]) -> None:
+        assert node.data is not None
+        self._cursor_is_dir = node.allow_expand
+        self.cursor_path = node.data.path
+
+    def sync_cursor(self) -> None:
+        node = self.directory_tree.cursor_node
+        if node is not None and node.data is not None:
+            self.set_cursor_node(node)
+        else:
+            self.cursor_path = None
+
+    def _flush_path_label(self) -> None:
+        self._label_timer = None
         self.update_path_label()
 
     def compose(self) -> ComposeResult:
         yield self.directory_tree
         yield self.path_label
 
+    def on_mount(self) -> None:
+        cast("FileExplorerApp", self.app)._panels.append(self)
+
+    def on_unmount(self) -> None:
+        panels = cast("FileExplorerApp", self.app)._panels
+        if self in panels:
+            panels.remove(self)
+
     def update_path_label(self) -> None:
+        label_key = (self._cursor_path, len(self.selected_paths))
+        if label_key == self._last_label_key:
+            return
+        self._last_label_key = label_key
         path_str = str(self.cursor_path) if self.cursor_path else "None"
-        self.path_label.update(f"{path_str}\nSelected: {len(self.selected_paths)}")
+        self.path_label.update(Text(f"{path_str}\nSelected: {label_key[1]}"))
 
     def reload_tree(self) -> None:
-        self.directory_tree.reload()
-        self.selected_paths.clear()
-        self.cursor_path = None
-        self.update_path_label()
+        clear_stat_cache()
+        with self.app.batch_update():
+            self.directory_tree.reload()
+            self.selected_paths.clear()
+            self.cursor_path = None
+            self.update_path_label()
+
+    def reload_paths(self, path_strs: list) -> None:
+        if self._start_str in path_strs:
+            self.reload_tree()
+            return
+        clear_stat_cache()
+        tree = self.directory_tree
+        nodes = {}
+        for path_str in path_strs:
+            relative = path_str[len(self._start_str) :]
+            node = tree.find_node(relative)
+            while node is None:
+                relative = os.path.dirname(relative.rstrip(os.sep))
+                node = tree.find_node(relative)
+            nodes[node.id] = node
+        for node in nodes.values():
+            if node.is_expanded:
+                tree.reload_node(node)
+            elif node.data is not None:
+                node.data.loaded = False
+        self.clear_selection()
+
+    def clear_selection(self) -> None:
+        with self.app.batch_update():
+            if self.selected_paths:
+                cleared = set(self.selected_paths)
+                self.selected_paths.clear()
+                self.directory_tree.refresh_paths(cleared)
+            self.update_path_label()
 
     def action_toggle_selection(self) -> None:
         if self.cursor_path:
-            if self.cursor_path in self.selected_paths:
-                self.selected_paths.remove(self.cursor_path)
+            path_str = os.fspath(self.cursor_path)
+            if path_str in self.selected_paths:
+                self.selected_paths.remove(path_str)
             else:
-                self.selected_paths.add(self.cursor_path)
-            self.directory_tree.refresh()
-            self.update_path_label()
+                self.selected_paths.add(path_str)
+            cursor_node = self.directory_tree.cursor_node
+            with self.app.batch_update():
+                if cursor_node is not None:
+                    cursor_node.refresh()
+                else:
+                    self.directory_tree.refresh()
+                self.update_path_label()
+
+
+class QueuedAction:
+    __slots__ = ("action", "target", "context")
+
+    def __init__(self, action: str, target: Path, context=None) -> None:
+        self.action = action
+        self.target = target
+        self.context = context
 
 
 class FileExplorerApp(App):
@@ -280,28 +997,76 @@ class FileExplorerApp(App):
         self.action_target_panel: Optional[FilePanel] = None
         self.action_context: dict = {}
         self.vim_mode = False
-        self.action_queue: Deque[tuple] = deque()
+        self.action_queue: Deque[QueuedAction] = deque()
+        self._preview_timer: Optional[Timer] = None
+        self._preview_pending: Optional[Path] = None
+        self._preview_path: Optional[Path] = None
+        self._preview_widget: Optional[Widget] = None
+        self._panels: list = []
+        self._submit_handlers = {
+            "command_mode": self._submit_command_mode,
+            "find": self._submit_find,
+            "copy_choice_prompt": self._submit_copy_choice,
+            "move_choice_prompt": self._submit_move_choice,
+            "add_panel": self._submit_add_panel,
+            "open_with_prompt": self._submit_open_with,
+            "delete_selected": self._submit_delete,
+            "archive_selected": self._submit_archive,
+            "extract_archive": self._submit_extract,
+            "copy_selected": self._submit_copy,
+            "copy_selected_vim": self._submit_copy_vim,
+            "move_selected": self._submit_move,
+            "rename": self._submit_rename,
+            "create_directory": self._submit_create_directory,
+        }
+        self._active_input: Optional[Input] = None
+        self._active_autocomplete: Optional["PathAutoComplete"] = None
+        self._path_completion_cache: LRUCache = LRUCache(PATH_COMPLETION_CACHE_SIZE)
+        self._pending_refresh: Set[Path] = set()
+        self._refresh_timer: Optional[Timer] = None
 
     def on_key(self, event: Key) -> None:
-        if event.character == ":" and not self.query(Input):
+        if event.character == ":" and self._active_input is None:
             self.action_command_mode()
             event.stop()
 
     def _validate_start_path(self, path: Optional[str]) -> str:
         if path:
-            candidate_path = Path(path).expanduser().resolve()
+            candidate_path = normalize_user_path(path)
             if candidate_path.is_dir():
                 return str(candidate_path)
-        return str(Path.home())
+        return HOME_DIR
 
     def _refresh_panels_at_path(self, path: Path) -> None:
+        clear_stat_cache()
+        self._path_completion_cache.clear()
         if not path.exists():
             return
-        for panel in self.query(FilePanel):
-            if Path(panel.start_path) == path or path.is_relative_to(
-                Path(panel.start_path)
-            ):
-                panel.reload_tree()
+        path_str = os.path.join(os.path.realpath(path), "")
+        for panel in self._panels:
+            if path_str.startswith(panel._start_str):
+                panel.reload_paths([path_str])
+
+    def _queue_refresh(self, path: Path) -> None:
+        clear_stat_cache()
+        self._path_completion_cache.clear()
+        self._pending_refresh.add(path)
+        if self._refresh_timer is not None:
+            self._refresh_timer.stop()
+        self._refresh_timer = self.set_timer(0.2, self._flush_refreshes)
+
+    def _flush_refreshes(self) -> None:
+        self._refresh_timer = None
+        path_strs = outermost_paths(
+            os.path.join(os.path.realpath(path), "")
+            for path in self._pending_refresh
+            if path.exists()
+        )
+        self._pending_refresh.clear()
+        for panel in self._panels:
+            affected = [p for p in path_strs if p.startswith(panel._start_str)]
+            if affected:
+                panel.reload_paths(affected)
 
     def compose(self) -> ComposeResult:
         yield Horizontal(
@@ -313,23 +1078,17 @@ class FileExplorerApp(App):
         yield Footer()
 
     def on_mount(self) -> None:
-        actions_handled_by_widget = [
-            "nav_up",
-            "nav_down",
-            "nav_parent",
-            "select_item",
-            "toggle_selection",
-        ]
         for action, details in DEFAULT_KEYBINDINGS.items():
-            if action not in actions_handled_by_widget:
+            if action not in TREE_KEY_ACTIONS:
                 self.bind(
-                    self.key_map.get(action, details["key"]),
-                    action,
-                    description=details["description"],
+                    self.key_map[action], action, description=details["description"]
                 )
 
+        self._main_container = self.query_one("#main_container")
+        self._preview_panel = self.query_one("#preview_panel")
+        self._vim_queue_log = self.query_one("#vim_queue", Log)
         first_panel = FilePanel(self.start_path, key_map=self.key_map)
-        self.query_one("#main_container").mount(first_panel)
+        self._main_container.mount(first_panel)
         first_panel.focus()
 
     @property
@@ -344,56 +1103,149 @@ class FileExplorerApp(App):
         return None
 
     def update_preview(self, path: Path) -> None:
-        preview_panel = self.query_one("#preview_panel")
-        preview_panel.remove_children()
-
-        if path.is_file():
-            if path.suffix.lower() in IMAGE_EXTENSIONS:
-                try:
-                    preview_panel.mount(ImageWidget(str(path)))
-                except Exception as e:
-                    preview_panel.mount(Static(f"Image preview failed:\n{e}"))
+        if self._preview_timer is not None:
+            self._preview_timer.stop()
+        self._preview_pending = path
+        self._preview_timer = self.set_timer(0.08, self._flush_preview)
+
+    def _flush_preview(self) -> None:
+        self._preview_timer = None
+        path = self._preview_pending
+        if path is None:
+            return
+        self._preview_pending = None
+        self._preview_path = path
+        if path_is_file(path):
+            suffix = path.suffix.lower()
+            if suffix in BINARY_EXTENSIONS:
+                self.workers.cancel_group(self, "preview")
+                self._show_preview(f"Cannot preview binary file: {path.name}")
+                return
+            if suffix in IMAGE_EXTENSIONS:
+                reader = self._load_image_preview
             else:
-                try:
-                    with open(path, "r", encoding="utf-8") as file:
-                        content = file.read(1024 * 10)
-                        syntax = Syntax(
-                            content,
-                            path.name,
-                            theme="monokai",
-                            line_numbers=True,
-                            word_wrap=True,
-                        )
-                        preview_panel.mount(syntax)
-                except Exception:
-                    preview_panel.mount(
-                        Static(f"Cannot preview binary file: {path.name}")
-                    )
+                reader = self._read_preview
+            self.run_worker(
+                lambda: reader(path),
+                thread=True,
+                exclusive=True,
+                group="preview",
+            )
+            return
+
+        self.workers.cancel_group(self, "preview")
+        self._show_preview("Directory - No preview available")
+
+    def _show_preview(self, renderable) -> None:
+        if isinstance(self._preview_widget, Static):
+            self._preview_widget.update(renderable)
         else:
-            preview_panel.mount(Static("Directory - No preview available"))
+            self._replace_preview(Static(renderable))
+
+    def _replace_preview(self, widget: Widget) -> None:
+        self._preview_panel.remove_children()
+        self._preview_panel.mount(widget)
+        self._preview_widget = widget
+
+    def _load_image_preview(self, path: Path) -> None:
+        image = None
+        notice = ""
+        try:
+            image = PILImage.open(path)
+            image.draft("RGB", IMAGE_PREVIEW_MAX_SIZE)
+            image.thumbnail(IMAGE_PREVIEW_MAX_SIZE)
+        except Exception as e:
+            image = None
+            notice = f"Image preview failed:\n{e}"
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._show_image_preview, path, image, notice)
+
+    def _show_image_preview(self, path: Path, image, notice: str) -> None:
+        if path != self._preview_path:
+            return
+        if image is None:
+            self._show_preview(notice)
+            return
+        try:
+            if isinstance(self._preview_widget, ImageWidget):
+                self._preview_widget.image = image
+            else:
+                self._replace_preview(ImageWidget(image))
+        except Exception as e:
+            self._show_preview(f"Image preview failed:\n{e}")
+
+    def _read_preview(self, path: Path) -> None:
+        content: Optional[str] = None
+        notice = f"Cannot preview binary file: {path.name}"
+        try:
+            try:
+                fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOATIME", 0))
+            except PermissionError:
+                fd = os.open(path, os.O_RDONLY)
+            data = None
+            try:
+                if os.fstat(fd).st_size <= PREVIEW_MAX_SIZE:
+                    data = os.read(fd, PREVIEW_BYTES)
+            finally:
+                os.close(fd)
+            if data is None:
+                notice = f"File too large to preview: {path.name}"
+            elif not looks_binary(data):
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                content = decoder.decode(data)
+        except Exception:
+            pass
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._show_text_preview, path, content, notice)
+
+    def _show_text_preview(
+        self, path: Path, content: Optional[str], notice: str
+    ) -> None:
+        if path != self._preview_path:
+            return
+        if content is None:
+            self._show_preview(notice)
+            return
+        from rich.syntax import Syntax
+
+        syntax = Syntax(
+            content,
+            path.name,
+            theme="monokai",
+            line_numbers=True,
+            word_wrap=True,
+        )
+        self._show_preview(syntax)
 
     def _prompt(
         self, placeholder: str, autocomplete: bool = False, value: str = ""
     ) -> None:
-        if self.query(Input):
+        if self._active_input is not None:
             return
         if autocomplete:
             input_widget = Input(placeholder=placeholder, value=value, id="path_input")
-            self.mount(input_widget, PathAutoComplete(target="#path_input"))
+            from textual_autocomplete import PathAutoComplete
+
+            self._active_autocomplete = PathAutoComplete(target=input_widget)
+            share_completion_cache(
+                self._active_autocomplete, self._path_completion_cache
+            )
+            self.mount(input_widget, self._active_autocomplete)
         else:
             input_widget = Input(placeholder=placeholder, value=value)
-        self.mount(input_widget)
+            self.mount(input_widget)
+        self._active_input = input_widget
         input_widget.focus()
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         user_input = event.value.strip()
         action = self.current_action
         panel = self.action_target_panel
+        if self._active_autocomplete is not None:
+            self._active_autocomplete.remove()
+            self._active_autocomplete = None
         event.input.remove()
-        try:
-            self.query_one(PathAutoComplete).remove()
-        except:
-            pass
+        self._active_input = None
         self.current_action = None
         self.action_target_panel = None
 
@@ -407,328 +1259,472 @@ class FileExplorerApp(App):
         ):
             return
 
-        if action == "command_mode":
-            self.handle_command(user_input)
+        handler = self._submit_handlers.get(action)
+        if handler is None or (panel is None and action in PANEL_INPUT_ACTIONS):
             return
+        handler(user_input, panel)
 
-        if action == "find":
-            if not panel:
-                self.notify("Error: No active panel to search in.", severity="error")
-                return
-            search_dir = Path(panel.start_path)
-            results = [p for p in search_dir.rglob(f"*{user_input}*")]
-            if results:
-                search_panel = SearchPanel(results)
-                self.query_one("#main_container").mount(search_panel)
-                search_panel.focus()
-            else:
-                self.notify("No results found.")
-            return
+    def _submit_command_mode(self, user_input: str, panel: FilePanel | None) -> None:
+        self.handle_command(user_input)
 
-        if action == "copy_choice_prompt":
-            choice = user_input.lower()
-            src_path = self.action_context.get("src_path")
-            dest_dir = self.action_context.get("dest_dir")
-            if not src_path or not dest_dir:
-                return
-
-            did_copy = False
-            if choice == "r":
-                if src_path.is_dir():
-                    shutil.copytree(
-                        src_path, dest_dir / src_path.name, dirs_exist_ok=True
-                    )
-                else:
-                    shutil.copy2(src_path, dest_dir)
-                did_copy = True
-            elif choice == "d":
-                shutil.copy2(
-                    src_path, generate_duplicate_path(dest_dir / src_path.name)
-                )
-                did_copy = True
-
-            if did_copy:
-                self._refresh_panels_at_path(dest_dir)
-
-            self.run_worker(self._process_copy_queue, thread=True, exclusive=True)
+    def _submit_find(self, user_input: str, panel: FilePanel | None) -> None:
+        if not panel:
+            self.notify("Error: No active panel to search in.", severity="error")
             return
+        search_dir = Path(panel.start_path)
+        search_panel = SearchPanel([])
+        self._main_container.mount(search_panel)
+        search_panel.focus()
+        self.run_worker(
+            lambda: self._find_worker(search_dir, user_input, search_panel),
+            thread=True,
+            exclusive=True,
+            group="find",
+        )
 
-        elif action == "move_choice_prompt":
-            choice = user_input.lower()
-            src_path = self.action_context.get("src_path")
-            dest_dir = self.action_context.get("dest_dir")
-            if not src_path or not dest_dir:
-                return
-
-            src_parent = src_path.parent
-            did_move = False
+    def _submit_copy_choice(self, user_input: str, panel: FilePanel | None) -> None:
+        choice = user_input.lower()
+        src_path = self.action_context.get("src_path")
+        dest_dir = self.action_context.get("dest_dir")
+        if not src_path or not dest_dir:
+            return
+        if choice not in ("r", "d"):
+            self._prompt_next_conflict("copy")
+            return
+        self.run_worker(
+            lambda: self._resolve_copy_conflict(src_path, dest_dir, choice),
+            thread=True,
+            exclusive=True,
+        )
 
-            if choice == "r":
-                dest_item = dest_dir / src_path.name
-                if dest_item.is_dir():
-                    shutil.rmtree(dest_item)
-                else:
-                    dest_item.unlink()
-                shutil.move(str(src_path), str(dest_dir))
-                did_move = True
-            elif choice == "d":
-                new_path = generate_duplicate_path(dest_dir / src_path.name)
-                if src_path.is_dir():
-                    shutil.copytree(src_path, new_path)
-                    shutil.rmtree(src_path)
-                else:
-                    shutil.copy2(src_path, new_path)
-                    src_path.unlink()
-                did_move = True
+    def _submit_move_choice(self, user_input: str, panel: FilePanel | None) -> None:
+        choice = user_input.lower()
+        src_path = self.action_context.get("src_path")
+        dest_dir = self.action_context.get("dest_dir")
+        if not src_path or not dest_dir:
+            return
+        if choice not in ("r", "d"):
+            self._prompt_next_conflict("move")
+            return
+        self.run_worker(
+            lambda: self._resolve_move_conflict(src_path, dest_dir, choice),
+            thread=True,
+            exclusive=True,
+        )
 
-            if src_parent:
-                self._refresh_panels_at_path(src_parent)
-            if did_move:
-                self._refresh_panels_at_path(dest_dir)
+    def _submit_add_panel(self, user_input: str, panel: FilePanel | None) -> None:
+        new_path = self._validate_start_path(user_input)
+        new_panel = FilePanel(path=new_path, key_map=self.key_map)
+        self._main_container.mount(new_panel)
+        new_panel.focus()
 
-            self.run_worker(self._process_move_queue, thread=True, exclusive=True)
+    def _submit_open_with(self, user_input: str, panel: FilePanel | None) -> None:
+        file_path = self.action_context.get("file_path")
+        if not file_path or not user_input:
             return
 
-        if action == "add_panel":
-            new_path = self._validate_start_path(user_input)
-            new_panel = FilePanel(path=new_path, key_map=self.key_map)
-            self.query_one("#main_container").mount(new_panel)
-            new_panel.focus()
+        try:
+            command_parts = shlex.split(user_input)
+        except ValueError as e:
+            self.notify(f"Error parsing command: {e}", severity="error")
             return
 
-        elif action == "open_with_prompt":
-            file_path = self.action_context.get("file_path")
-            if not file_path or not user_input:
-                return
+        if not command_parts:
+            self.notify("Error: No command entered.", severity="error")
+            return
 
-            try:
-                command_parts = shlex.split(user_input)
-            except ValueError as e:
-                self.notify(f"Error parsing command: {e}", severity="error")
-                return
+        command_name = command_parts[0]
+        full_command = command_parts + [str(file_path)]
 
-            if not command_parts:
-                self.notify("Error: No command entered.", severity="error")
-                return
+        try:
+            subprocess.Popen(
+                full_command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            self.notify(f"Executing: {' '.join(full_command)}")
+        except FileNotFoundError:
+            self.notify(f"Error: Command not found '{command_name}'.", severity="error")
+        except Exception as e:
+            self.notify(f"Error executing command: {e}", severity="error")
 
-            command_name = command_parts[0]
-            full_command = command_parts + [str(file_path)]
+    def _submit_delete(self, user_input: str, panel: FilePanel) -> None:
+        if user_input.lower() != "y":
+            return
+        selected = outermost_paths(panel.selected_paths)
+        panel.clear_selection()
+        self.run_worker(
+            lambda: self._delete_worker(selected), thread=True, group="delete"
+        )
 
+    def _delete_worker(self, selected: list) -> None:
+        failures = []
+        pool = file_op_pool()
+        futures = {pool.submit(remove_path, p): p for p in selected}
+        for future in as_completed(futures):
             try:
-                subprocess.Popen(
-                    full_command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                )
-                self.notify(f"Executing: {' '.join(full_command)}")
-            except FileNotFoundError:
-                self.notify(
-                    f"Error: Command not found '{command_name}'.", severity="error"
-                )
+                future.result()
             except Exception as e:
-                self.notify(f"Error executing command: {e}", severity="error")
+                failures.append((os.path.basename(futures[future]), e))
+        if failures:
+            self.call_from_thread(
+                self.notify, failure_summary("deleting", failures), severity="error"
+            )
+        else:
+            self.call_from_thread(self.notify, "Deleted items.")
+        for parent in {os.path.dirname(p) for p in selected}:
+            self.call_from_thread(self._queue_refresh, Path(parent))
 
-        if not panel:
+    def _submit_archive(self, user_input: str, panel: FilePanel) -> None:
+        archive_path = normalize_user_path(user_input)
+        if not archive_path.suffix:
+            self.notify(
+                "Error: Archive path must have an extension (e.g., .zip).",
+                severity="error",
+            )
             return
+        sources = list(map(Path, panel.selected_paths))
+        self.run_worker(
+            lambda: self._archive_worker(archive_path, sources),
+            thread=True,
+            group="archive",
+        )
 
-        if action == "delete_selected" and user_input.lower() == "y":
-            try:
-                paths_to_refresh = {p.parent for p in panel.selected_paths if p.parent}
-                for path in list(panel.selected_paths):
-                    if path.is_dir():
-                        shutil.rmtree(path)
-                    else:
-                        path.unlink()
-                panel.selected_paths.clear()
-                self.notify(f"Deleted items.")
-                for path in paths_to_refresh:
-                    self._refresh_panels_at_path(path)
-                panel.update_path_label()
-            except Exception as e:
-                self.notify(f"Error deleting: {e}", severity="error")
-
-        elif action == "archive_selected":
-            archive_path = Path(user_input).expanduser().resolve()
-            archive_format = archive_path.suffix.lstrip(".")
-            if not archive_format:
-                self.notify(
-                    "Error: Archive path must have an extension (e.g., .zip).",
-                    severity="error",
-                )
-                return
-            archive_base_name = str(archive_path.with_suffix(""))
-            try:
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    for item_path in panel.selected_paths:
-                        dest_path = Path(tmpdir) / item_path.name
-                        if item_path.is_dir():
-                            shutil.copytree(item_path, dest_path)
-                        else:
-                            shutil.copy2(item_path, dest_path)
-                    shutil.make_archive(archive_base_name, archive_format, tmpdir)
-                self.notify(f"Created archive '{archive_path.name}'.")
-                self._refresh_panels_at_path(archive_path.parent)
-            except Exception as e:
-                self.notify(f"Error creating archive: {e}", severity="error")
-
-        elif action == "extract_archive":
-            if panel.cursor_path:
-                dest_path = (
-                    Path(user_input).expanduser().resolve()
-                    if user_input
-                    else panel.cursor_path.parent
-                )
-                dest_path.mkdir(parents=True, exist_ok=True)
-                try:
-                    shutil.unpack_archive(panel.cursor_path, dest_path)
-                    self.notify(f"Extracted to '{dest_path}'.")
-                    self._refresh_panels_at_path(dest_path)
-                except Exception as e:
-                    self.notify(f"Error extracting archive: {e}", severity="error")
-        elif action == "copy_selected":
-            dest_path = Path(user_input).expanduser().resolve()
-            if not dest_path.is_dir():
-                self.notify(
-                    f"Error: '{dest_path}' is not a valid directory.", severity="error"
-                )
-                return
-            self.action_context = {
-                "copy_queue": list(panel.selected_paths),
-                "dest_dir": dest_path,
-            }
-            self.run_worker(self._process_copy_queue, thread=True, exclusive=True)
-
-        elif action == "copy_selected_vim":
-            dest_path = Path(user_input).expanduser().resolve()
-            if not dest_path.is_dir():
-                self.notify(
-                    f"'{dest_path}' is not a valid directory.", severity="error"
-                )
-                return
-            for path in panel.selected_paths:
-                self.queue_action("copy", path, dest_path / path.name)
-            self.notify(f"Queued copy of {len(panel.selected_paths)} items.")
-            panel.selected_paths.clear()
-            panel.directory_tree.refresh()
-
-        elif action == "move_selected":
-            dest_path = Path(user_input).expanduser().resolve()
-            if not dest_path.is_dir():
-                self.notify(
-                    f"Error: '{dest_path}' is not a valid directory.", severity="error"
-                )
-                return
-            self.action_context = {
-                "move_queue": list(panel.selected_paths),
-                "dest_dir": dest_path,
-            }
-            self.run_worker(self._process_move_queue, thread=True, exclusive=True)
+    def _submit_extract(self, user_input: str, panel: FilePanel) -> None:
+        if panel.cursor_path:
+            archive = panel.cursor_path
+            dest_path = (
+                normalize_user_path(user_input) if user_input else archive.parent
+            )
+            self.run_worker(
+                lambda: self._extract_worker(archive, dest_path),
+                thread=True,
+                group="archive",
+            )
 
-        elif action == "rename" and panel.cursor_path:
-            try:
-                old_path = panel.cursor_path
-                new_path = old_path.with_name(user_input)
-                if new_path.exists():
-                    self.notify(
-                        f"Error: '{user_input}' already exists.", severity="error"
-                    )
-                    return
-                old_path.rename(new_path)
-                self.notify(f"Renamed to '{user_input}'.")
-                self._refresh_panels_at_path(new_path.parent)
-            except Exception as e:
-                self.notify(f"Error renaming: {e}", severity="error")
-        elif action == "create_directory":
-            parent = (
-                panel.cursor_path
-                if panel.cursor_path and panel.cursor_path.is_dir()
-                else (
-                    panel.cursor_path.parent
-                    if panel.cursor_path
-                    else Path(panel.start_path)
-                )
+    def _submit_copy(self, user_input: str, panel: FilePanel) -> None:
+        dest_path = normalize_user_path(user_input)
+        if not dest_path.is_dir():
+            self.notify(
+                f"Error: '{dest_path}' is not a valid directory.", severity="error"
             )
-            try:
-                new_dir = parent / user_input
-                new_dir.mkdir()
-                self.notify(f"Created directory '{user_input}'.")
-                self._refresh_panels_at_path(new_dir.parent)
-            except Exception as e:
-                self.notify(f"Error creating directory: {e}", severity="error")
+            return
+        self.action_context = {
+            "copy_queue": [Path(p) for p in panel.selected_paths],
+            "dest_dir": dest_path,
+        }
+        self.run_worker(self._process_copy_queue, thread=True, exclusive=True)
+
+    def _submit_copy_vim(self, user_input: str, panel: FilePanel) -> None:
+        dest_path = normalize_user_path(user_input)
+        if not dest_path.is_dir():
+            self.notify(f"'{dest_path}' is not a valid directory.", severity="error")
+            return
+        for path in map(Path, panel.selected_paths):
+            self.queue_action("copy", path, dest_path / path.name)
+        self.notify(f"Queued copy of {len(panel.selected_paths)} items.")
+        panel.clear_selection()
+
+    def _submit_move(self, user_input: str, panel: FilePanel) -> None:
+        dest_path = normalize_user_path(user_input)
+        if not dest_path.is_dir():
+            self.notify(
+                f"Error: '{dest_path}' is not a valid directory.", severity="error"
+            )
+            return
+        self.action_context = {
+            "move_queue": [Path(p) for p in panel.selected_paths],
+            "dest_dir": dest_path,
+        }
+        self.run_worker(self._process_move_queue, thread=True, exclusive=True)
+
+    def _submit_rename(self, user_input: str, panel: FilePanel) -> None:
+        if not panel.cursor_path:
+            return
+        old_path = panel.cursor_path
+        new_path = old_path.with_name(user_input)
+        self.run_worker(
+            lambda: self._rename_worker(old_path, new_path),
+            thread=True,
+            group="rename",
+        )
 
-    def _process_move_queue(self) -> None:
-        move_queue = self.action_context.get("move_queue", [])
-        dest_dir = self.action_context.get("dest_dir")
+    def _submit_create_directory(self, user_input: str, panel: FilePanel) -> None:
+        parent = (
+            panel.cursor_path
+            if panel.cursor_is_dir
+            else (
+                panel.cursor_path.parent
+                if panel.cursor_path
+                else Path(panel.start_path)
+            )
+        )
+        new_dir = parent / user_input
+        self.run_worker(
+            lambda: self._create_directory_worker(new_dir),
+            thread=True,
+            group="create_directory",
+        )
 
-        if not move_queue or not dest_dir:
-            if dest_dir:
-                self.call_from_thread(self._refresh_panels_at_path, dest_dir)
-            self.call_from_thread(self.notify, "Move operation complete.")
-            self.action_context = {}
-            return
+    def _rename_worker(self, old_path: Path, new_path: Path) -> None:
+        try:
+            rename_noreplace(old_path, new_path)
+            self.call_from_thread(self.notify, f"Renamed to '{new_path.name}'.")
+            self.call_from_thread(self._refresh_panels_at_path, new_path.parent)
+        except FileExistsError:
+            self.call_from_thread(
+                self.notify,
+                f"Error: '{new_path.name}' already exists.",
+                severity="error",
+            )
+        except Exception as e:
+            self.call_from_thread(self.notify, f"Error renaming: {e}", severity="error")
 
-        src_path = move_queue.pop(0)
-        full_dest_path = dest_dir / src_path.name
+    def _create_directory_worker(self, new_dir: Path) -> None:
+        try:
+            os.mkdir(new_dir)
+            self.call_from_thread(self.notify, f"Created directory '{new_dir.name}'.")
+            self.call_from_thread(self._refresh_panels_at_path, new_dir.parent)
+        except FileExistsError:
+            self.call_from_thread(
+                self.notify,
+                f"Error: '{new_dir.name}' already exists.",
+                severity="error",
+            )
+        except Exception as e:
+            self.call_from_thread(
+                self.notify, f"Error creating directory: {e}", severity="error"
+            )
 
-        if full_dest_path.exists():
-            self.current_action = "move_choice_prompt"
-            self.action_context["src_path"] = src_path
+    def _archive_worker(self, archive_path: Path, sources: list) -> None:
+        try:
+            write_archive(archive_path, sources)
             self.call_from_thread(
-                self._prompt,
-                f"'{src_path.name}' exists. Replace (r), Duplicate (d), or Skip (s)?",
+                self.notify, f"Created archive '{archive_path.name}'."
+            )
+            self.call_from_thread(self._refresh_panels_at_path, archive_path.parent)
+        except Exception as e:
+            self.call_from_thread(
+                self.notify, f"Error creating archive: {e}", severity="error"
             )
-            return
 
+    def _extract_worker(self, archive: Path, dest_path: Path) -> None:
         try:
-            src_parent = src_path.parent
-            shutil.move(str(src_path), str(dest_dir))
-            if src_parent:
-                self.call_from_thread(self._refresh_panels_at_path, src_parent)
-            self.run_worker(self._process_move_queue, thread=True, exclusive=True)
+            created = not dest_path.exists()
+            dest_path.mkdir(parents=True, exist_ok=True)
+            shutil.unpack_archive(archive, dest_path, get_unpack_format(archive))
+            self.call_from_thread(self.notify, f"Extracted to '{dest_path}'.")
+            self.call_from_thread(
+                self._refresh_panels_at_path,
+                dest_path.parent if created else dest_path,
+            )
         except Exception as e:
             self.call_from_thread(
-                self.notify, f"Error moving {src_path.name}: {e}", severity="error"
+                self.notify, f"Error extracting archive: {e}", severity="error"
             )
-            self.run_worker(self._process_move_queue, thread=True, exclusive=True)
+
+    def _find_worker(self, root: Path, needle: str, search_panel: SearchPanel) -> None:
+        matches: list[str] = []
+
+        def scan(directory: str) -> list[str]:
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if needle in entry.name:
+                            matches.append(entry.path)
+                        try:
+                            if (
+                                entry.is_dir(follow_symlinks=False)
+                                and entry.name not in IGNORED_DIRS
+                            ):
+                                subdirs.append(entry.path)
+                        except OSError:
+                            pass
+            except OSError:
+                pass
+            return subdirs
+
+        worker = get_current_worker()
+        sent = 0
+        last_flush = time.monotonic()
+        pool = file_op_pool()
+        pending = {pool.submit(scan, str(root))}
+        while pending:
+            if worker.is_cancelled:
+                for future in pending:
+                    future.cancel()
+                return
+            done, pending = wait(
+                pending, timeout=SEARCH_FLUSH_INTERVAL, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                for subdir in future.result():
+                    pending.add(pool.submit(scan, subdir))
+            now = time.monotonic()
+            if len(matches) > sent and (
+                len(matches) - sent >= SEARCH_BATCH_SIZE
+                or now - last_flush >= SEARCH_FLUSH_INTERVAL
+            ):
+                sent = self._flush_search_results(search_panel, matches, sent)
+                last_flush = now
+
+        if len(matches) > sent:
+            sent = self._flush_search_results(search_panel, matches, sent)
+        if not sent:
+            self.call_from_thread(self._no_search_results, search_panel)
+
+    def _flush_search_results(
+        self, search_panel: SearchPanel, matches: list, sent: int
+    ) -> int:
+        batch = sorted(matches[sent:])
+        self.call_from_thread(
+            self._append_search_results, search_panel, [Path(p) for p in batch]
+        )
+        return sent + len(batch)
+
+    def _append_search_results(
+        self, search_panel: SearchPanel, results: list[Path]
+    ) -> None:
+        if search_panel.is_attached:
+            search_panel.query_one(SearchResultTree).extend(results)
+
+    def _no_search_results(self, search_panel: SearchPanel) -> None:
+        if search_panel.is_attached:
+            search_panel.remove()
+            self.notify("No results found.")
+            if self.active_panel:
+                self.active_panel.focus()
+
+    def _process_move_queue(self) -> None:
+        move_queue = self.action_context.get("move_queue", [])
+        dest_dir = self.action_context.get("dest_dir")
+        conflicts = self.action_context.setdefault("conflicts", deque())
+
+        if move_queue and dest_dir:
+            claimed = set(os.listdir(dest_dir))
+            src_parents: Set[Path] = set()
+            pool = file_op_pool()
+            futures = {}
+            for src_path in move_queue:
+                if src_path.name in claimed:
+                    conflicts.append(src_path)
+                    continue
+                claimed.add(src_path.name)
+                future = pool.submit(move_path, src_path, dest_dir / src_path.name)
+                futures[future] = src_path
+            failures = []
+            for future in as_completed(futures):
+                src_path = futures[future]
+                try:
+                    future.result()
+                    src_parents.add(src_path.parent)
+                except Exception as e:
+                    failures.append((src_path.name, e))
+            if failures:
+                self.call_from_thread(
+                    self.notify, failure_summary("moving", failures), severity="error"
+                )
+            move_queue.clear()
+            for src_parent in src_parents:
+                self.call_from_thread(self._queue_refresh, src_parent)
+
+        if dest_dir:
+            self.call_from_thread(self._queue_refresh, dest_dir)
+        self.call_from_thread(self._prompt_next_conflict, "move")
 
     def _process_copy_queue(self) -> None:
         copy_queue = self.action_context.get("copy_queue", [])
         dest_dir = self.action_context.get("dest_dir")
+        conflicts = self.action_context.setdefault("conflicts", deque())
+
+        if copy_queue and dest_dir:
+            existing = set(os.listdir(dest_dir))
+            claimed: Set[str] = set()
+            pool = file_op_pool()
+            futures = {}
+            for src_path in copy_queue:
+                full_dest_path = dest_dir / src_path.name
+                if src_path.name in claimed or (
+                    src_path.name in existing
+                    and not same_path(src_path, full_dest_path)
+                ):
+                    conflicts.append(src_path)
+                    continue
+                claimed.add(src_path.name)
+                future = pool.submit(copy_path, src_path, full_dest_path)
+                futures[future] = src_path
+            failures = []
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append((futures[future].name, e))
+            if failures:
+                self.call_from_thread(
+                    self.notify, failure_summary("copying", failures), severity="error"
+                )
+            copy_queue.clear()
+            self.call_from_thread(self._queue_refresh, dest_dir)
 
-        if not copy_queue or not dest_dir:
-            self.call_from_thread(self.notify, "Copy operation complete.")
-            self.action_context = {}
-            return
-
-        src_path = copy_queue.pop(0)
-        full_dest_path = dest_dir / src_path.name
+        self.call_from_thread(self._prompt_next_conflict, "copy")
 
-        if full_dest_path.exists() and src_path.resolve() != full_dest_path.resolve():
-            self.current_action = "copy_choice_prompt"
+    def _prompt_next_conflict(self, operation: str) -> None:
+        conflicts = self.action_context.get("conflicts")
+        if conflicts:
+            src_path = conflicts.popleft()
+            self.current_action = f"{operation}_choice_prompt"
             self.action_context["src_path"] = src_path
-            self.call_from_thread(
-                self._prompt,
-                f"'{src_path.name}' exists. Replace (r), Duplicate (d), or Skip (s)?",
+            self._prompt(
+                f"'{src_path.name}' exists. Replace (r), Duplicate (d), or Skip (s)?"
             )
             return
+        self.notify(f"{operation.capitalize()} operation complete.")
+        self.action_context = {}
 
+    def _resolve_copy_conflict(
+        self, src_path: Path, dest_dir: Path, choice: str
+    ) -> None:
         try:
-            if src_path.is_dir():
-                shutil.copytree(src_path, full_dest_path, dirs_exist_ok=True)
-            else:
-                shutil.copy2(src_path, full_dest_path)
-            self.call_from_thread(self._refresh_panels_at_path, dest_dir)
-            self.run_worker(self._process_copy_queue, thread=True, exclusive=True)
+            if choice == "r":
+                copy_path(src_path, dest_dir / src_path.name, replace=True)
+                self.call_from_thread(self._queue_refresh, dest_dir)
+            elif choice == "d":
+                copy_path(src_path, generate_duplicate_path(dest_dir / src_path.name))
+                self.call_from_thread(self._queue_refresh, dest_dir)
         except Exception as e:
             self.call_from_thread(
                 self.notify, f"Error copying {src_path.name}: {e}", severity="error"
             )
-            self.run_worker(self._process_copy_queue, thread=True, exclusive=True)
+        self.call_from_thread(self._prompt_next_conflict, "copy")
+
+    def _resolve_move_conflict(
+        self, src_path: Path, dest_dir: Path, choice: str
+    ) -> None:
+        src_parent = src_path.parent
+        did_move = False
+        try:
+            if choice == "r":
+                dest_item = dest_dir / src_path.name
+                remove_path(dest_item)
+                move_path(src_path, dest_item)
+                did_move = True
+            elif choice == "d":
+                move_path(src_path, generate_duplicate_path(dest_dir / src_path.name))
+                did_move = True
+        except Exception as e:
+            self.call_from_thread(
+                self.notify, f"Error moving {src_path.name}: {e}", severity="error"
+            )
+
+        if src_parent:
+            self.call_from_thread(self._queue_refresh, src_parent)
+        if did_move:
+            self.call_from_thread(self._queue_refresh, dest_dir)
+        self.call_from_thread(self._prompt_next_conflict, "move")
 
     def handle_command(self, command: str) -> None:
         if command == "vim":
             self.vim_mode = not self.vim_mode
-            self.query_one("#vim_queue", Log).styles.display = (
-                "block" if self.vim_mode else "none"
-            )
+            self._vim_queue_log.styles.display = "block" if self.vim_mode else "none"
             self.notify(f"Vim mode {'enabled' if self.vim_mode else 'disabled'}")
             self.update_vim_queue_display()
         elif command == "w":
@@ -744,46 +1740,74 @@ class FileExplorerApp(App):
 
     def update_vim_queue_display(self) -> None:
         if self.vim_mode:
-            log_widget = self.query_one("#vim_queue", Log)
+            log_widget = self._vim_queue_log
             log_widget.clear()
-            for action, target, _ in self.action_queue:
-                log_widget.write_line(f"{action}: {target.name}")
+            for item in self.action_queue:
+                log_widget.write_line(f"{item.action}: {item.target.name}")
 
     def execute_action_queue(self) -> None:
-        while self.action_queue:
-            action, target, context = self.action_queue.popleft()
-            if action == "delete":
-                try:
-                    if target.is_dir():
-                        shutil.rmtree(target)
-                    else:
-                        target.unlink()
-                    self.notify(f"Deleted {target.name}")
-                    self._refresh_panels_at_path(target.parent)
-                except Exception as e:
-                    self.notify(f"Error deleting {target.name}: {e}", severity="error")
-            elif action == "copy":
-                try:
-                    if target.is_dir():
-                        shutil.copytree(target, context)
-                    else:
-                        shutil.copy2(target, context)
-                    self.notify(f"Copied {target.name} to {context}")
-                    self._refresh_panels_at_path(Path(context).parent)
-                except Exception as e:
-                    self.notify(f"Error copying {target.name}: {e}", severity="error")
+        items = list(self.action_queue)
+        if items:
+            self.action_queue.clear()
+            self.update_vim_queue_display()
+            self.run_worker(
+                lambda: self._run_action_queue(items),
+                thread=True,
+                group="action_queue",
+            )
 
+    def _run_action_queue(self, items: list) -> None:
+        results = []
+        pool = file_op_pool()
+        for _, batch in groupby(items, key=attrgetter("action")):
+            results.extend(pool.map(self._run_queued_action, batch))
+        failures = {"delete": [], "copy": []}
+        refresh_paths = set()
+        for item, error in results:
+            if error is None:
+                refresh_paths.add(
+                    item.target.parent
+                    if item.action == "delete"
+                    else Path(item.context).parent
+                )
+            else:
+                failures[item.action].append((item.target.name, error))
+        done = len(results) - sum(map(len, failures.values()))
+        if done:
+            self.call_from_thread(self.notify, f"Completed {done} queued actions.")
+        for action, verb in (("delete", "deleting"), ("copy", "copying")):
+            if failures[action]:
+                self.call_from_thread(
+                    self.notify,
+                    failure_summary(verb, failures[action]),
+                    severity="error",
+                )
+        for path in refresh_paths:
+            self.call_from_thread(self._queue_refresh, path)
+        self.call_from_thread(self._finish_action_queue)
+
+    def _run_queued_action(self, item: QueuedAction) -> tuple:
+        error = None
+        try:
+            if item.action == "delete":
+                remove_path(item.target)
+            elif item.action == "copy":
+                copy_path(item.target, Path(item.context))
+        except Exception as e:
+            error = e
+        return item, error
+
+    def _finish_action_queue(self) -> None:
         self.update_vim_queue_display()
         if self.active_panel:
-            self.active_panel.selected_paths.clear()
-            self.active_panel.directory_tree.refresh()
+            self.active_panel.clear_selection()
 
     def queue_action(self, action: str, target, context=None) -> None:
-        self.action_queue.append((action, target, context))
+        self.action_queue.append(QueuedAction(action, target, context))
         self.update_vim_queue_display()
 
     def action_toggle_preview(self) -> None:
-        preview_panel = self.query_one("#preview_panel")
+        preview_panel = self._preview_panel
         if preview_panel.styles.display == "none":
             preview_panel.styles.display = "block"
         else:
@@ -791,7 +1815,7 @@ class FileExplorerApp(App):
 
     def action_open_file(self) -> None:
         panel = self.active_panel
-        if panel and panel.cursor_path and panel.cursor_path.is_file():
+        if panel and panel.cursor_path and path_is_file(panel.cursor_path):
             file_path = panel.cursor_path
             try:
                 self.notify(f"Opening {file_path.name}...")
@@ -812,15 +1836,11 @@ class FileExplorerApp(App):
 
     def action_open_with_prompt(self) -> None:
         panel = self.active_panel
-        if panel and panel.cursor_path and panel.cursor_path.is_file():
+        if panel and panel.cursor_path and path_is_file(panel.cursor_path):
             self.current_action = "open_with_prompt"
             self.action_target_panel = panel
             self.action_context = {"file_path": panel.cursor_path}
-            default_opener = (
-                "xdg-open"
-                if sys.platform != "win32" and sys.platform != "darwin"
-                else ""
-            )
+            default_opener = "xdg-open" if IS_UNIX else ""
             self._prompt("Open with:", value=default_opener)
         else:
             self.notify("Please select a file to open.", severity="warning")
@@ -838,9 +1858,9 @@ class FileExplorerApp(App):
 
     def action_open_panel_at_selection(self) -> None:
         panel = self.active_panel
-        if panel and panel.cursor_path and panel.cursor_path.is_dir():
+        if panel and panel.cursor_path and path_is_dir(panel.cursor_path):
             new_panel = FilePanel(path=str(panel.cursor_path), key_map=self.key_map)
-            self.query_one("#main_container").mount(new_panel)
+            self._main_container.mount(new_panel)
             new_panel.focus()
         else:
             self.notify(
@@ -848,22 +1868,22 @@ class FileExplorerApp(App):
             )
 
     def action_close_panel(self) -> None:
-        all_panels = list(self.query(FilePanel))
+        panels = self._panels
         active = self.active_panel
-        if len(all_panels) > 1 and active:
+        if len(panels) > 1 and active:
             try:
-                current_index = all_panels.index(active)
+                current_index = panels.index(active)
             except ValueError:
                 return
             active.remove()
-            remaining_panels = list(self.query(FilePanel))
-            focus_index = min(current_index, len(remaining_panels) - 1)
-            if remaining_panels:
-                remaining_panels[focus_index].focus()
+            panels.remove(active)
+            focus_index = min(current_index, len(panels) - 1)
+            panels[focus_index].directory_tree.focus()
 
     def action_close_search_panel(self) -> None:
         search_panels = self.query(SearchPanel)
         if search_panels:
+            self.workers.cancel_group(self, "find")
             search_panels.last().remove()
             if self.active_panel:
                 self.active_panel.focus()
@@ -878,7 +1898,7 @@ class FileExplorerApp(App):
                 if panel.cursor_path
                 else Path(panel.start_path)
             )
-            first_item_name = Path(list(panel.selected_paths)[0]).stem
+            first_item_name = Path(next(iter(panel.selected_paths))).stem
             default_name = (
                 f"{first_item_name}.zip"
                 if len(panel.selected_paths) == 1
@@ -891,11 +1911,7 @@ class FileExplorerApp(App):
 
     def action_extract_archive(self) -> None:
         panel = self.active_panel
-        if (
-            panel
-            and panel.cursor_path
-            and str(panel.cursor_path).endswith(SUPPORTED_ARCHIVE_EXTENSIONS)
-        ):
+        if panel and panel.cursor_path and get_unpack_format(panel.cursor_path):
             self.current_action = "extract_archive"
             self.action_target_panel = panel
             self._prompt(
@@ -912,11 +1928,11 @@ class FileExplorerApp(App):
         panel = self.active_panel
         if panel and panel.selected_paths:
             if self.vim_mode:
-                for path in panel.selected_paths.copy():
-                    self.queue_action("delete", path)
-                self.notify(f"Queued deletion of {len(panel.selected_paths)} items.")
-                panel.selected_paths.clear()
-                panel.directory_tree.refresh()
+                targets = outermost_paths(panel.selected_paths)
+                for path_str in targets:
+                    self.queue_action("delete", Path(path_str))
+                self.notify(f"Queued deletion of {len(targets)} items.")
+                panel.clear_selection()
             else:
                 self.current_action = "delete_selected"
                 self.action_target_panel = panel